@@ -38,6 +38,7 @@ class TelegramBot:
         # Initialize services with application
         self.notification_service = TelegramNotificationService(application)
         self.notification_service.user_repo = self.user_repo
+        self.notification_service.auction_repo = self.auction_repo
         
         self.auction_service = AuctionService(
             self.user_repo, 
@@ -49,7 +50,8 @@ class TelegramBot:
         self.handlers = TelegramHandlers(
             self.auction_service,
             self.user_repo,
-            self.auction_repo
+            self.auction_repo,
+            self.notification_service
         )
         
         # Register all handlers
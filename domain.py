@@ -5,7 +5,7 @@ Domain entities and business rules
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 from uuid import UUID
 
 
@@ -53,6 +53,28 @@ class Bid:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class AuctionSummary:
+    """Lightweight auction projection for listing and scheduling without bids"""
+    auction_id: UUID
+    title: str
+    status: AuctionStatus
+    current_price: float
+    created_at: datetime
+    end_time: Optional[datetime] = None
+
+
+@dataclass
+class AuctionParticipation:
+    """A user's standing in an active auction they joined, without the auction's bids"""
+    auction_id: UUID
+    title: str
+    current_price: float
+    end_time: Optional[datetime]
+    user_bid: Optional[Bid]
+    is_leader: bool
+
+
 @dataclass
 class Auction:
     """Auction entity with business logic"""
@@ -70,8 +92,17 @@ class Auction:
     end_time: Optional[datetime] = None
     created_at: datetime = field(default_factory=datetime.now)
     participants: Set[int] = field(default_factory=set)
+    participant_names: Dict[int, str] = field(default_factory=dict)  # Non-blocked participants' usernames
     bids: List[Bid] = field(default_factory=list)
     current_leader: Optional[Bid] = None
+    version: int = 0
+
+    def apply_bid(self, bid: Bid) -> None:
+        """Record an accepted bid, keeping price and leader in step without rescanning bids"""
+        self.bids.append(bid)
+        self.current_price = bid.amount
+        self.current_leader = bid
+        self.version += 1
 
     @property
     def is_active(self) -> bool:
@@ -2,12 +2,13 @@
 Telegram bot handlers with inline keyboards and improved UX
 """
 
+import html
 from uuid import UUID
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update, ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
 from telegram.ext import ContextTypes, ConversationHandler
 
 from domain import Auction, AuctionStatus
-from services import AuctionService
+from services import AuctionService, TelegramNotificationService, auction_keyboard
 from repositories import UserRepository, AuctionRepository
 
 
@@ -27,10 +28,12 @@ class BotStates:
 class TelegramHandlers:
     """All Telegram bot handlers with inline keyboards"""
     
-    def __init__(self, auction_service: AuctionService, user_repo: UserRepository, auction_repo: AuctionRepository):
+    def __init__(self, auction_service: AuctionService, user_repo: UserRepository, auction_repo: AuctionRepository,
+                 notification_service: TelegramNotificationService):
         self.auction_service = auction_service
         self.user_repo = user_repo
         self.auction_repo = auction_repo
+        self.notification_service = notification_service  # Shared HTML formatting of auction cards
         self.bid_contexts = {}  # user_id -> auction_id for bidding
 
     # ============ KEYBOARD GENERATORS ============
@@ -75,8 +78,8 @@ class TelegramHandlers:
             if user.is_admin:
                 keyboard = self.get_admin_keyboard()
                 await update.message.reply_text(
-                    f"👋 Добро пожаловать, *{user.display_name}*!\n\nВы вошли как администратор.",
-                    parse_mode='Markdown', 
+                    f"👋 Добро пожаловать, <b>{html.escape(user.display_name)}</b>!\n\nВы вошли как администратор.",
+                    parse_mode='HTML', 
                     reply_markup=keyboard
                 )
                 # Show current auction for admin too
@@ -88,28 +91,33 @@ class TelegramHandlers:
             # New user - show current auction with registration
             current_auction = await self.auction_service.get_current_auction()
             if current_auction:
-                auction_message = await self._format_auction_message(current_auction)
+                auction_message = await self.notification_service.format_auction_message(current_auction)
                 keyboard = InlineKeyboardMarkup([[
                     InlineKeyboardButton("✅ Участвовать", callback_data=f"register_join_{current_auction.auction_id}")
                 ], [
                     InlineKeyboardButton("ℹ️ Обновить статус", callback_data=f"status_{current_auction.auction_id}")
                 ]])
                 
-                welcome_msg = current_auction.custom_message or "🎯 *Добро пожаловать в Аукцион-бот!*\n\nДля участия в аукционе необходимо зарегистрироваться."
-                
-                await update.message.reply_text(welcome_msg, parse_mode='Markdown')
+                if current_auction.custom_message:
+                    # Admin text is shown literally, as in the new-auction broadcast
+                    await update.message.reply_text(current_auction.custom_message)
+                else:
+                    await update.message.reply_text(
+                        "🎯 <b>Добро пожаловать в Аукцион-бот!</b>\n\nДля участия в аукционе необходимо зарегистрироваться.",
+                        parse_mode='HTML'
+                    )
                 
                 # Send media if available
                 if current_auction.photo_url:
                     await self.send_auction_media(update, current_auction, auction_message, keyboard)
                 else:
-                    await update.message.reply_text(auction_message, parse_mode='Markdown', reply_markup=keyboard)
+                    await update.message.reply_text(auction_message, parse_mode='HTML', reply_markup=keyboard)
             else:
                 await update.message.reply_text(
-                    "🎯 *Добро пожаловать в Аукцион-бот!*\n\n"
+                    "🎯 <b>Добро пожаловать в Аукцион-бот!</b>\n\n"
                     "Сейчас нет активных аукционов.\n"
                     "Нажмите кнопку ниже для регистрации.",
-                    parse_mode='Markdown',
+                    parse_mode='HTML',
                     reply_markup=InlineKeyboardMarkup([[
                         InlineKeyboardButton("📝 Зарегистрироваться", callback_data="register_start")
                     ]])
@@ -120,25 +128,21 @@ class TelegramHandlers:
         current_auction = await self.auction_service.get_current_auction()
         
         if current_auction:
-            auction_message = await self._format_auction_message(current_auction)
-            keyboard = self._get_auction_keyboard(current_auction.auction_id, user.user_id in current_auction.participants)
-            # Create new keyboard with additional button
-            new_keyboard = list(keyboard.inline_keyboard)
-            new_keyboard.append([InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")])
-            keyboard = InlineKeyboardMarkup(new_keyboard)
+            auction_message = await self.notification_service.format_auction_message(current_auction)
+            keyboard = auction_keyboard(current_auction.auction_id, user.user_id in current_auction.participants)
             
             # Send media if available
             if current_auction.photo_url:
                 await self.send_auction_media(update, current_auction, auction_message, keyboard)
             else:
-                await update.message.reply_text(auction_message, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_text(auction_message, parse_mode='HTML', reply_markup=keyboard)
         else:
             # Show next scheduled auction if available
             next_auction = await self.auction_service.get_next_scheduled_auction()
             if next_auction:
-                message = f"⏳ *Следующий аукцион:*\n\n" + await self._format_auction_message(next_auction)
+                message = f"⏳ <b>Следующий аукцион:</b>\n\n" + await self.notification_service.format_auction_message(next_auction)
                 keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")]])
-                await update.message.reply_text(message, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_text(message, parse_mode='HTML', reply_markup=keyboard)
             else:
                 keyboard = self.get_main_menu_keyboard()
                 await update.message.reply_text("📭 Сейчас нет активных аукционов", reply_markup=keyboard)
@@ -148,28 +152,28 @@ class TelegramHandlers:
         current_auction = await self.auction_service.get_current_auction()
         
         if current_auction:
-            auction_message = await self._format_auction_message(current_auction)
-            await update.message.reply_text(f"📊 *Текущий аукцион:*\n\n{auction_message}", parse_mode='Markdown')
+            auction_message = await self.notification_service.format_auction_message(current_auction)
+            await update.message.reply_text(f"📊 <b>Текущий аукцион:</b>\n\n{auction_message}", parse_mode='HTML')
         else:
             next_auction = await self.auction_service.get_next_scheduled_auction()
             if next_auction:
-                message = f"⏳ *Следующий аукцион:*\n\n" + await self._format_auction_message(next_auction)
-                await update.message.reply_text(message, parse_mode='Markdown')
+                message = f"⏳ <b>Следующий аукцион:</b>\n\n" + await self.notification_service.format_auction_message(next_auction)
+                await update.message.reply_text(message, parse_mode='HTML')
 
     async def send_auction_media(self, update: Update, auction: Auction, caption: str, keyboard: InlineKeyboardMarkup):
         """Send auction media with caption"""
         try:
             if auction.media_type == 'photo':
-                await update.message.reply_photo(photo=auction.photo_url, caption=caption, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_photo(photo=auction.photo_url, caption=caption, parse_mode='HTML', reply_markup=keyboard)
             elif auction.media_type == 'video':
-                await update.message.reply_video(video=auction.photo_url, caption=caption, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_video(video=auction.photo_url, caption=caption, parse_mode='HTML', reply_markup=keyboard)
             elif auction.media_type == 'animation':
-                await update.message.reply_animation(animation=auction.photo_url, caption=caption, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_animation(animation=auction.photo_url, caption=caption, parse_mode='HTML', reply_markup=keyboard)
             else:
-                await update.message.reply_text(caption, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_text(caption, parse_mode='HTML', reply_markup=keyboard)
         except Exception:
             # Fallback to text if media fails
-            await update.message.reply_text(caption, parse_mode='Markdown', reply_markup=keyboard)
+            await update.message.reply_text(caption, parse_mode='HTML', reply_markup=keyboard)
 
     async def handle_text(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages from keyboards"""
@@ -220,10 +224,10 @@ class TelegramHandlers:
         if data == "main_menu":
             keyboard = self.get_main_menu_keyboard()
             try:
-                await query.edit_message_text("📱 *Главное меню*\n\nВыберите действие:", parse_mode='Markdown', reply_markup=keyboard)
+                await query.edit_message_text("📱 <b>Главное меню</b>\n\nВыберите действие:", parse_mode='HTML', reply_markup=keyboard)
             except Exception:
                 # If can't edit (e.g. media message), send new message
-                await query.message.reply_text("📱 *Главное меню*\n\nВыберите действие:", parse_mode='Markdown', reply_markup=keyboard)
+                await query.message.reply_text("📱 <b>Главное меню</b>\n\nВыберите действие:", parse_mode='HTML', reply_markup=keyboard)
         
         elif data == "menu_current_auction":
             await self.show_current_auction_callback(query, context)
@@ -330,14 +334,14 @@ class TelegramHandlers:
         
         if success:
             user = await self.user_repo.get_user(update.effective_user.id)
-            message = f"✅ Регистрация успешна! Ваш логин: *{username}*"
+            message = f"✅ Регистрация успешна! Ваш логин: <b>{html.escape(username)}</b>"
             
             if user.is_admin:
                 keyboard = self.get_admin_keyboard()
                 message += "\n\nВы вошли как администратор."
-                await update.message.reply_text(message, parse_mode='Markdown', reply_markup=keyboard)
+                await update.message.reply_text(message, parse_mode='HTML', reply_markup=keyboard)
             else:
-                await update.message.reply_text(message, parse_mode='Markdown', reply_markup=ReplyKeyboardRemove())
+                await update.message.reply_text(message, parse_mode='HTML', reply_markup=ReplyKeyboardRemove())
             
             # If joining auction after registration
             if 'join_auction_id' in context.user_data:
@@ -345,13 +349,13 @@ class TelegramHandlers:
                 await self.auction_service.join_auction(auction_id, update.effective_user.id)
                 auction = await self.auction_repo.get_auction(auction_id)
                 if auction:
-                    auction_message = await self._format_auction_message(auction)
-                    auction_keyboard = self._get_auction_keyboard(auction_id, True)
+                    auction_message = await self.notification_service.format_auction_message(auction)
+                    keyboard = auction_keyboard(auction_id, True)
                     
                     if auction.photo_url:
-                        await self.send_auction_media(update, auction, auction_message, auction_keyboard)
+                        await self.send_auction_media(update, auction, auction_message, keyboard)
                     else:
-                        await update.message.reply_text(auction_message, parse_mode='Markdown', reply_markup=auction_keyboard)
+                        await update.message.reply_text(auction_message, parse_mode='HTML', reply_markup=keyboard)
                 del context.user_data['join_auction_id']
             else:
                 # Show current auction after registration
@@ -370,29 +374,25 @@ class TelegramHandlers:
         user_id = query.from_user.id
         
         if current_auction:
-            message = await self._format_auction_message(current_auction)
-            keyboard = self._get_auction_keyboard(current_auction.auction_id, user_id in current_auction.participants)
-            # Create new keyboard with additional button
-            new_keyboard = list(keyboard.inline_keyboard)
-            new_keyboard.append([InlineKeyboardButton("◀️ Назад", callback_data="main_menu")])
-            keyboard = InlineKeyboardMarkup(new_keyboard)
+            message = await self.notification_service.format_auction_message(current_auction)
+            keyboard = auction_keyboard(current_auction.auction_id, user_id in current_auction.participants)
             
             try:
-                await query.edit_message_text(message, reply_markup=keyboard, parse_mode='Markdown')
+                await query.edit_message_text(message, reply_markup=keyboard, parse_mode='HTML')
             except Exception:
-                await query.message.reply_text(message, reply_markup=keyboard, parse_mode='Markdown')
+                await query.message.reply_text(message, reply_markup=keyboard, parse_mode='HTML')
         else:
             next_auction = await self.auction_service.get_next_scheduled_auction()
             if next_auction:
-                message = f"⏳ *Следующий аукцион:*\n\n" + await self._format_auction_message(next_auction)
+                message = f"⏳ <b>Следующий аукцион:</b>\n\n" + await self.notification_service.format_auction_message(next_auction)
             else:
                 message = "📭 Сейчас нет активных аукционов"
             
             keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("◀️ Назад", callback_data="main_menu")]])
             try:
-                await query.edit_message_text(message, parse_mode='Markdown', reply_markup=keyboard)
+                await query.edit_message_text(message, parse_mode='HTML', reply_markup=keyboard)
             except Exception:
-                await query.message.reply_text(message, parse_mode='Markdown', reply_markup=keyboard)
+                await query.message.reply_text(message, parse_mode='HTML', reply_markup=keyboard)
 
     async def show_profile_callback(self, query, context):
         """Show user profile from callback"""
@@ -403,30 +403,26 @@ class TelegramHandlers:
             return
         
         user = status["user"]
-        message = f"👤 *Ваш профиль*\n\n"
-        message += f"Логин: {user.username}\n"
-        message += f"Имя: {user.display_name}\n"
+        message = f"👤 <b>Ваш профиль</b>\n\n"
+        message += f"Логин: {html.escape(user.username)}\n"
+        message += f"Имя: {html.escape(user.display_name)}\n"
         message += f"Статус: {'👑 Администратор' if user.is_admin else '👤 Участник'}\n"
         message += f"Регистрация: {user.created_at.strftime('%d.%m.%Y %H:%M')}\n\n"
         
         if status["participating_in"]:
-            message += "📊 *Участие в аукционах:*\n"
+            message += "📊 <b>Участие в аукционах:</b>\n"
             for participation in status["participating_in"]:
-                auction = participation["auction"]
-                user_bid = participation["user_bid"]
-                is_leader = participation["is_leader"]
-                
-                message += f"\n🎯 {auction.title}\n"
-                if user_bid:
-                    message += f"Ваша ставка: {user_bid.amount:,.0f}₽\n"
-                    message += f"Статус: {'🏆 Лидер' if is_leader else '👤 Участник'}\n"
+                message += f"\n🎯 {html.escape(participation.title)}\n"
+                if participation.user_bid:
+                    message += f"Ваша ставка: {participation.user_bid.amount:,.0f}₽\n"
+                    message += f"Статус: {'🏆 Лидер' if participation.is_leader else '👤 Участник'}\n"
                 else:
                     message += "Ставок нет\n"
         else:
             message += "Вы не участвуете в аукционах"
         
         keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("◀️ Назад", callback_data="main_menu")]])
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=keyboard)
+        await query.edit_message_text(message, parse_mode='HTML', reply_markup=keyboard)
 
     async def show_history_callback(self, query, context):
         """Show auction history from callback"""
@@ -435,34 +431,38 @@ class TelegramHandlers:
         if not completed_auctions:
             message = "📭 История аукционов пуста"
         else:
-            message = "📊 *История аукционов:*\n\n"
-            for auction in completed_auctions[:5]:  # Show last 5
-                message += f"🎯 *{auction.title}*\n"
+            message = "📊 <b>История аукционов:</b>\n\n"
+            recent = completed_auctions[:5]  # Show last 5
+            users = await self.user_repo.get_users(
+                auction.current_leader.user_id for auction in recent if auction.current_leader
+            )
+            for auction in recent:
+                message += f"🎯 <b>{html.escape(auction.title)}</b>\n"
                 message += f"💰 Итоговая цена: {auction.current_price:,.0f}₽\n"
                 
                 if auction.current_leader:
-                    leader_user = await self.user_repo.get_user(auction.current_leader.user_id)
+                    leader_user = users.get(auction.current_leader.user_id)
                     leader_name = leader_user.display_name if leader_user else auction.current_leader.username
-                    message += f"🏆 Победитель: {leader_name}\n"
+                    message += f"🏆 Победитель: {html.escape(leader_name)}\n"
                 
                 message += f"📅 {auction.created_at.strftime('%d.%m.%Y')}\n\n"
         
         keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("◀️ Назад", callback_data="main_menu")]])
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=keyboard)
+        await query.edit_message_text(message, parse_mode='HTML', reply_markup=keyboard)
 
     async def show_help_callback(self, query, context):
         """Show help from callback"""
         message = (
-            "ℹ️ *Помощь по боту*\n\n"
-            "🎯 *Текущий аукцион* - показать активный аукцион\n"
-            "👤 *Мой профиль* - ваша информация и статистика\n"
-            "📊 *История* - прошлые аукционы\n\n"
+            "ℹ️ <b>Помощь по боту</b>\n\n"
+            "🎯 <b>Текущий аукцион</b> - показать активный аукцион\n"
+            "👤 <b>Мой профиль</b> - ваша информация и статистика\n"
+            "📊 <b>История</b> - прошлые аукционы\n\n"
             "Для участия в аукционе нажмите '✅ Участвовать', "
             "затем используйте '💸 Перебить ставку' для размещения ставок."
         )
         
         keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("◀️ Назад", callback_data="main_menu")]])
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=keyboard)
+        await query.edit_message_text(message, parse_mode='HTML', reply_markup=keyboard)
 
     async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show auction status"""
@@ -472,9 +472,9 @@ class TelegramHandlers:
             # Show scheduled auctions if no active ones
             scheduled = await self.auction_repo.get_scheduled_auctions()
             if scheduled:
-                message = "⏳ *Следующие аукционы:*\n\n"
+                message = "⏳ <b>Следующие аукционы:</b>\n\n"
                 for auction in scheduled[:3]:  # Show first 3
-                    message += f"🎯 *{auction.title}*\n"
+                    message += f"🎯 <b>{html.escape(auction.title)}</b>\n"
                     message += f"💰 Стартовая цена: {auction.start_price:,.0f}₽\n"
                     if auction.time_until_start:
                         message += f"⏰ Начнется через: {auction.time_until_start}\n"
@@ -482,17 +482,20 @@ class TelegramHandlers:
             else:
                 message = "📭 Нет активных или запланированных аукционов"
         else:
-            message = "📊 *Активные аукционы:*\n\n"
+            message = "📊 <b>Активные аукционы:</b>\n\n"
+            users = await self.user_repo.get_users(
+                auction.current_leader.user_id for auction in auctions if auction.current_leader
+            )
             for auction in auctions:
-                message += f"🎯 *{auction.title}*\n"
+                message += f"🎯 <b>{html.escape(auction.title)}</b>\n"
                 message += f"💰 Текущая цена: {auction.current_price:,.0f}₽\n"
                 
                 leader = auction.current_leader
                 if leader:
                     # Get user display name for leader
-                    leader_user = await self.user_repo.get_user(leader.user_id)
+                    leader_user = users.get(leader.user_id)
                     leader_name = leader_user.display_name if leader_user else leader.username
-                    message += f"👤 Лидер: {leader_name}\n"
+                    message += f"👤 Лидер: {html.escape(leader_name)}\n"
                 
                 message += f"👥 Участников: {len(auction.participants)}\n"
                 
@@ -503,7 +506,7 @@ class TelegramHandlers:
                 
                 message += "\n"
         
-        await update.message.reply_text(message, parse_mode='Markdown')
+        await update.message.reply_text(message, parse_mode='HTML')
 
     async def show_scheduled_auctions(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show scheduled auctions (admin only)"""
@@ -513,15 +516,15 @@ class TelegramHandlers:
             await update.message.reply_text("📭 Нет отложенных аукционов")
             return
         
-        message = "📋 *Отложенные аукционы:*\n\n"
+        message = "📋 <b>Отложенные аукционы:</b>\n\n"
         for i, auction in enumerate(scheduled_auctions, 1):
-            message += f"{i}. *{auction.title}*\n"
+            message += f"{i}. <b>{html.escape(auction.title)}</b>\n"
             message += f"💰 Стартовая цена: {auction.start_price:,.0f}₽\n"
             if auction.time_until_start:
                 message += f"⏰ Начнется через: {auction.time_until_start}\n"
             message += "\n"
         
-        await update.message.reply_text(message, parse_mode='Markdown')
+        await update.message.reply_text(message, parse_mode='HTML')
 
     async def end_auction(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """End auction (admin only)"""
@@ -530,7 +533,7 @@ class TelegramHandlers:
             await update.message.reply_text("❌ Только администраторы могут завершать аукционы")
             return
         
-        auctions = await self.auction_repo.get_active_auctions()
+        auctions = await self.auction_repo.get_auction_summaries(AuctionStatus.ACTIVE)
         if not auctions:
             await update.message.reply_text("📭 Активных аукционов нет")
             return
@@ -600,52 +603,6 @@ class TelegramHandlers:
             
         return ConversationHandler.END
 
-    # ============ UTILITY METHODS ============
-
-    async def _format_auction_message(self, auction: Auction) -> str:
-        """Format auction information message"""
-        message = f"🎯 *{auction.title}*\n\n"
-        
-        if auction.description:
-            message += f"📄 {auction.description}\n\n"
-        
-        message += f"💰 Текущая цена: *{auction.current_price:,.0f}₽*\n"
-        
-        leader = auction.current_leader
-        if leader:
-            # Get user display name for leader
-            leader_user = await self.user_repo.get_user(leader.user_id)
-            leader_name = leader_user.display_name if leader_user else leader.username
-            message += f"👤 Лидер: {leader_name}\n"
-        
-        message += f"👥 Участников: {len(auction.participants)}\n"
-        message += f"📊 Ставок: {len(auction.bids)}\n"
-        
-        if auction.is_scheduled:
-            if auction.time_until_start:
-                message += f"⏰ Начнется через: {auction.time_until_start}\n"
-            else:
-                message += "⏰ Готов к запуску\n"
-        elif auction.time_remaining:
-            message += f"⏰ Осталось: {auction.time_remaining}\n"
-        else:
-            message += "⏰ Бессрочный\n"
-        
-        return message
-
-    def _get_auction_keyboard(self, auction_id: UUID, is_participant: bool = False) -> InlineKeyboardMarkup:
-        """Generate auction inline keyboard"""
-        keyboard = []
-        
-        if not is_participant:
-            keyboard.append([InlineKeyboardButton("✅ Участвовать", callback_data=f"join_{auction_id}")])
-        else:
-            keyboard.append([InlineKeyboardButton("💸 Перебить ставку", callback_data=f"bid_{auction_id}")])
-        
-        keyboard.append([InlineKeyboardButton("ℹ️ Обновить статус", callback_data=f"status_{auction_id}")])
-        
-        return InlineKeyboardMarkup(keyboard)
-
     # ============ ADMIN USER MANAGEMENT ============
 
     async def show_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -672,9 +629,9 @@ class TelegramHandlers:
         keyboard.append([InlineKeyboardButton("❌ Закрыть", callback_data="cancel_users")])
         
         await update.message.reply_text(
-            f"👥 *Пользователи ({len(users)}):*\n\n"
+            f"👥 <b>Пользователи ({len(users)}):</b>\n\n"
             "✅ - активный\n🚫 - заблокированный\n👑 - администратор",
-            parse_mode='Markdown',
+            parse_mode='HTML',
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
@@ -697,9 +654,9 @@ class TelegramHandlers:
         keyboard.append([InlineKeyboardButton("❌ Закрыть", callback_data="cancel_users")])
         
         await query.edit_message_text(
-            f"👥 *Пользователи ({len(users)}):*\n\n"
+            f"👥 <b>Пользователи ({len(users)}):</b>\n\n"
             "✅ - активный\n🚫 - заблокированный\n👑 - администратор",
-            parse_mode='Markdown',
+            parse_mode='HTML',
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
@@ -720,11 +677,11 @@ class TelegramHandlers:
                 InlineKeyboardButton("◀️ Назад к списку", callback_data="back_to_users")
             ]])
             await query.edit_message_text(
-                f"👑 *Администратор*\n\n"
-                f"👤 {target_user.display_name}\n"
+                f"👑 <b>Администратор</b>\n\n"
+                f"👤 {html.escape(target_user.display_name)}\n"
                 f"📅 Регистрация: {target_user.created_at.strftime('%d.%m.%Y')}\n\n"
                 "⚠️ Нельзя заблокировать администратора",
-                parse_mode='Markdown',
+                parse_mode='HTML',
                 reply_markup=keyboard
             )
             return
@@ -740,12 +697,12 @@ class TelegramHandlers:
         status = "🚫 Заблокирован" if target_user.is_blocked else "✅ Активен"
         
         await query.edit_message_text(
-            f"👤 *Пользователь*\n\n"
-            f"Имя: {target_user.display_name}\n"
+            f"👤 <b>Пользователь</b>\n\n"
+            f"Имя: {html.escape(target_user.display_name)}\n"
             f"Статус: {status}\n"
             f"Регистрация: {target_user.created_at.strftime('%d.%m.%Y %H:%M')}\n\n"
             "Выберите действие:",
-            parse_mode='Markdown',
+            parse_mode='HTML',
             reply_markup=keyboard
         )
 
@@ -763,7 +720,7 @@ class TelegramHandlers:
             await query.edit_message_text("❌ Ошибка: пользователь не найден или является администратором")
             return
         
-        await self.user_repo.update_user_status(user_id, is_blocking)
+        await self.auction_service.set_user_blocked(user_id, is_blocking)
         
         action_text = "заблокирован" if is_blocking else "разблокирован"
         await query.edit_message_text(
@@ -783,8 +740,8 @@ class TelegramHandlers:
             return ConversationHandler.END
         
         await update.message.reply_text(
-            "📝 *Создание аукциона*\n\nВведите название лота:",
-            parse_mode='Markdown',
+            "📝 <b>Создание аукциона</b>\n\nВведите название лота:",
+            parse_mode='HTML',
             reply_markup=self.get_cancel_keyboard()
         )
         return BotStates.CREATE_TITLE
@@ -918,9 +875,6 @@ class TelegramHandlers:
                 "✅ Аукцион создан и запущен!",
                 reply_markup=self.get_admin_keyboard()
             )
-            
-            # Broadcast to all users
-            await self.broadcast_new_auction(auction)
         else:
             await update.message.reply_text(
                 "✅ Аукцион создан и добавлен в очередь!",
@@ -929,61 +883,6 @@ class TelegramHandlers:
         
         return ConversationHandler.END
 
-    async def broadcast_new_auction(self, auction: Auction):
-        """Broadcast new auction to all users"""
-        all_users = await self.user_repo.get_all_users()
-        
-        for user in all_users:
-            if user.is_blocked or user.is_admin:
-                continue
-                
-            try:
-                welcome_msg = auction.custom_message or "🎉 *Новый аукцион начался!*"
-                auction_message = await self._format_auction_message(auction)
-                keyboard = self._get_auction_keyboard(auction.auction_id, user.user_id in auction.participants)
-                
-                await self.auction_service.notification_service.application.bot.send_message(
-                    chat_id=user.user_id,
-                    text=welcome_msg,
-                    parse_mode='Markdown'
-                )
-                
-                if auction.photo_url:
-                    if auction.media_type == 'photo':
-                        await self.auction_service.notification_service.application.bot.send_photo(
-                            chat_id=user.user_id,
-                            photo=auction.photo_url,
-                            caption=auction_message,
-                            parse_mode='Markdown',
-                            reply_markup=keyboard
-                        )
-                    elif auction.media_type == 'video':
-                        await self.auction_service.notification_service.application.bot.send_video(
-                            chat_id=user.user_id,
-                            video=auction.photo_url,
-                            caption=auction_message,
-                            parse_mode='Markdown',
-                            reply_markup=keyboard
-                        )
-                    elif auction.media_type == 'animation':
-                        await self.auction_service.notification_service.application.bot.send_animation(
-                            chat_id=user.user_id,
-                            animation=auction.photo_url,
-                            caption=auction_message,
-                            parse_mode='Markdown',
-                            reply_markup=keyboard
-                        )
-                else:
-                    await self.auction_service.notification_service.application.bot.send_message(
-                        chat_id=user.user_id,
-                        text=auction_message,
-                        parse_mode='Markdown',
-                        reply_markup=keyboard
-                    )
-            except Exception as e:
-                # Log error but continue with other users
-                pass
-
     # ============ BIDDING HANDLERS ============
 
     async def bid_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1019,15 +918,15 @@ class TelegramHandlers:
         
         self.bid_contexts[user_id] = auction_id
         bid_message = (
-            f"💸 Текущая ставка: *{auction.current_price:,.0f}₽*\n\n"
+            f"💸 Текущая ставка: <b>{auction.current_price:,.0f}₽</b>\n\n"
             f"Введите вашу ставку (больше {auction.current_price:,.0f}₽):"
         )
         
         try:
-            await query.edit_message_text(bid_message, parse_mode='Markdown')
+            await query.edit_message_text(bid_message, parse_mode='HTML')
         except Exception:
             # If can't edit (media message), send new message
-            await query.message.reply_text(bid_message, parse_mode='Markdown')
+            await query.message.reply_text(bid_message, parse_mode='HTML')
         
         return BotStates.PLACE_BID
 
@@ -1055,17 +954,13 @@ class TelegramHandlers:
                 # Show updated auction
                 auction = await self.auction_repo.get_auction(auction_id)
                 if auction:
-                    message = await self._format_auction_message(auction)
-                    keyboard = self._get_auction_keyboard(auction_id, True)
-                    # Create new keyboard with additional button
-                    new_keyboard = list(keyboard.inline_keyboard)
-                    new_keyboard.append([InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")])
-                    keyboard = InlineKeyboardMarkup(new_keyboard)
+                    message = await self.notification_service.format_auction_message(auction)
+                    keyboard = auction_keyboard(auction_id, True)
                     
                     if auction.photo_url:
                         await self.send_auction_media(update, auction, message, keyboard)
                     else:
-                        await update.message.reply_text(message, reply_markup=keyboard, parse_mode='Markdown')
+                        await update.message.reply_text(message, reply_markup=keyboard, parse_mode='HTML')
             else:
                 auction = await self.auction_repo.get_auction(auction_id)
                 await update.message.reply_text(
@@ -1112,18 +1007,14 @@ class TelegramHandlers:
         success = await self.auction_service.join_auction(auction_id, user_id)
         if success:
             auction = await self.auction_repo.get_auction(auction_id)
-            message = await self._format_auction_message(auction)
-            keyboard = self._get_auction_keyboard(auction_id, user_id in auction.participants)
-            # Create new keyboard with additional button
-            new_keyboard = list(keyboard.inline_keyboard)
-            new_keyboard.append([InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")])
-            keyboard = InlineKeyboardMarkup(new_keyboard)
+            message = await self.notification_service.format_auction_message(auction)
+            keyboard = auction_keyboard(auction_id, user_id in auction.participants)
             
             try:
-                await query.edit_message_text(message, reply_markup=keyboard, parse_mode='Markdown')
+                await query.edit_message_text(message, reply_markup=keyboard, parse_mode='HTML')
             except Exception:
                 # If can't edit (media message), send new message
-                await query.message.reply_text(message, reply_markup=keyboard, parse_mode='Markdown')
+                await query.message.reply_text(message, reply_markup=keyboard, parse_mode='HTML')
         else:
             try:
                 await query.edit_message_text("❌ Не удалось присоединиться к аукциону")
@@ -1145,15 +1036,11 @@ class TelegramHandlers:
                 await query.message.reply_text("❌ Аукцион не найден")
             return
         
-        message = await self._format_auction_message(auction)
-        keyboard = self._get_auction_keyboard(auction_id, update.effective_user.id in auction.participants)
-        # Create new keyboard with additional button
-        new_keyboard = list(keyboard.inline_keyboard)
-        new_keyboard.append([InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")])
-        keyboard = InlineKeyboardMarkup(new_keyboard)
+        message = await self.notification_service.format_auction_message(auction)
+        keyboard = auction_keyboard(auction_id, update.effective_user.id in auction.participants)
         
         try:
-            await query.edit_message_text(message, reply_markup=keyboard, parse_mode='Markdown')
+            await query.edit_message_text(message, reply_markup=keyboard, parse_mode='HTML')
         except Exception:
             # If can't edit (media message), send new message
-            await query.message.reply_text(message, reply_markup=keyboard, parse_mode='Markdown')
\ No newline at end of file
+            await query.message.reply_text(message, reply_markup=keyboard, parse_mode='HTML')
\ No newline at end of file
@@ -9,6 +9,7 @@ import sys
 from dotenv import load_dotenv
 
 from bot import TelegramBot
+from repositories import close_connections
 from services import AuctionScheduler
 
 
@@ -37,8 +38,12 @@ async def main():
     # Create application
     application = bot.create_application(token)
     
+    # Start delivering queued notifications before anything can enqueue them
+    bot.notification_service.queue.start()
+    
     # Create and start scheduler
     scheduler = AuctionScheduler(bot.auction_service, bot.auction_repo)
+    bot.auction_service.scheduler = scheduler
     scheduler_task = asyncio.create_task(scheduler.start())
     
     try:
@@ -69,9 +74,11 @@ async def main():
             except asyncio.CancelledError:
                 pass
         
+        await bot.notification_service.queue.stop()
         await application.updater.stop()
         await application.stop()
         await application.shutdown()
+        await close_connections()
 
 
 if __name__ == '__main__':
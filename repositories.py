@@ -2,13 +2,127 @@
 Repository implementations for data persistence
 """
 
+import asyncio
+import logging
 import sqlite3
+import time
 import aiosqlite
-from datetime import datetime
-from typing import List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID, uuid4
 
-from domain import User, Auction, AuctionStatus, Bid
+from domain import User, Auction, AuctionParticipation, AuctionStatus, AuctionSummary, Bid
+
+
+# Two long-lived connections per database file, shared by all repositories: one for writes
+# and a query-only one for reads, so reads never see a write transaction's uncommitted changes
+_connections: Dict[str, aiosqlite.Connection] = {}
+_read_connections: Dict[str, aiosqlite.Connection] = {}
+_write_locks: Dict[str, asyncio.Lock] = {}
+_connect_lock = asyncio.Lock()
+
+
+async def get_connection(db_path: str, readonly: bool = False) -> aiosqlite.Connection:
+    """Get a shared connection for a database file, opening it on first use"""
+    connections = _read_connections if readonly else _connections
+    db = connections.get(db_path)
+    if db is not None:
+        return db
+    
+    async with _connect_lock:
+        if db_path not in _connections:
+            db = await aiosqlite.connect(db_path)
+            db.row_factory = aiosqlite.Row
+            # WAL lets the read connection proceed while a bid is being written
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("PRAGMA synchronous=NORMAL")
+            await db.execute("PRAGMA temp_store=MEMORY")
+            await db.execute("PRAGMA cache_size=-64000")
+            _connections[db_path] = db
+            _write_locks[db_path] = asyncio.Lock()
+        if readonly and db_path not in _read_connections:
+            db = await aiosqlite.connect(db_path)
+            db.row_factory = aiosqlite.Row
+            await db.execute("PRAGMA query_only=ON")
+            await db.execute("PRAGMA temp_store=MEMORY")
+            await db.execute("PRAGMA cache_size=-64000")
+            _read_connections[db_path] = db
+        return connections[db_path]
+
+
+async def close_connections() -> None:
+    """Close all shared connections"""
+    async with _connect_lock:
+        for db in [*_read_connections.values(), *_connections.values()]:
+            await db.close()
+        _read_connections.clear()
+        _connections.clear()
+        _write_locks.clear()
+
+
+@asynccontextmanager
+async def _connect(db_path: str):
+    """Use the shared read connection, which only sees committed data"""
+    yield await get_connection(db_path, readonly=True)
+
+
+@asynccontextmanager
+async def _transaction(db_path: str):
+    """Use the shared connection for a write, committed as one transaction"""
+    db = await get_connection(db_path)
+    # Writes are serialized so one caller's commit never includes another's half-done changes
+    async with _write_locks[db_path]:
+        try:
+            yield db
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+
+
+class _LRUCache:
+    """Bounded in-memory cache with per-entry expiry for repository lookups"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0  # Bumped on every invalidation
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        """Return cached value or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, generation: int) -> None:
+        """Store a value loaded at the given generation, unless it was invalidated meanwhile"""
+        if generation != self.generation:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        """Drop a key after its underlying data changed"""
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate) -> None:
+        """Drop every entry whose value matches predicate"""
+        self.generation += 1
+        for key in [key for key, (value, _) in self._entries.items() if predicate(value)]:
+            del self._entries[key]
 
 
 class UserRepository:
@@ -31,6 +145,12 @@ class UserRepository:
     
     async def get_all_users(self) -> List[User]:
         pass
+    
+    async def iter_all_users(self) -> AsyncIterator[User]:
+        pass
+    
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        pass
 
 
 class AuctionRepository:
@@ -48,9 +168,33 @@ class AuctionRepository:
     async def update_auction_status(self, auction_id: UUID, status: AuctionStatus) -> bool:
         pass
     
+    async def activate_auction(self, auction_id: UUID, end_time: Optional[datetime]) -> bool:
+        pass
+    
+    async def update_auction_media(self, auction_id: UUID, photo_url: str) -> bool:
+        pass
+    
     async def get_active_auctions(self) -> List[Auction]:
         pass
     
+    async def get_auction_summaries(self, status: AuctionStatus) -> List[AuctionSummary]:
+        pass
+    
+    async def has_active_auction(self) -> bool:
+        pass
+    
+    async def tick(self, now: datetime, activation_delay: timedelta) -> Tuple[List[Auction], Optional[Auction]]:
+        pass
+    
+    async def get_next_end_time(self) -> Optional[datetime]:
+        pass
+    
+    async def get_user_participation(self, user_id: int) -> List[AuctionParticipation]:
+        pass
+    
+    async def get_next_scheduled_created_at(self) -> Optional[datetime]:
+        pass
+    
     async def get_scheduled_auctions(self) -> List[Auction]:
         pass
     
@@ -60,7 +204,10 @@ class AuctionRepository:
     async def add_participant(self, auction_id: UUID, user_id: int) -> bool:
         pass
     
-    async def add_bid(self, bid: Bid) -> bool:
+    async def invalidate_participant(self, user_id: int) -> None:
+        pass
+    
+    async def add_bid(self, bid: Bid, expected_version: int) -> bool:
         pass
     
     async def get_auction_bids(self, auction_id: UUID) -> List[Bid]:
@@ -72,10 +219,11 @@ class SQLiteUserRepository(UserRepository):
     
     def __init__(self, db_path: str = "auction.db"):
         self.db_path = db_path
+        self._cache = _LRUCache(maxsize=4096, ttl=300)
 
     async def init_db(self):
         """Initialize user table"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with _transaction(self.db_path) as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS users (
                     user_id INTEGER PRIMARY KEY,
@@ -89,101 +237,122 @@ class SQLiteUserRepository(UserRepository):
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
-            await db.commit()
 
     async def create_user(self, user: User) -> bool:
         """Create a new user"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with _transaction(self.db_path) as db:
                 await db.execute("""
                     INSERT INTO users (user_id, username, telegram_username, first_name, last_name, display_name, is_admin, is_blocked, created_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (user.user_id, user.username, user.telegram_username, user.first_name, user.last_name, user.display_name, user.is_admin, user.is_blocked, user.created_at))
-                await db.commit()
                 return True
         except sqlite3.IntegrityError:
             return False
+        finally:
+            self._cache.invalidate(user.user_id)
 
     async def get_user(self, user_id: int) -> Optional[User]:
-        """Get user by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        """Get user by ID, served from cache when possible"""
+        user = self._cache.get(user_id)
+        if user is None:
+            generation = self._cache.generation
+            user = await self._load_user(user_id)
+            if user:
+                self._cache.set(user_id, user, generation)
+        return user
+
+    async def _load_user(self, user_id: int) -> Optional[User]:
+        """Load user by ID from the database"""
+        async with _connect(self.db_path) as db:
             async with db.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return User(
-                        user_id=row['user_id'],
-                        username=row['username'],
-                        telegram_username=row['telegram_username'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        display_name=row['display_name'],
-                        is_admin=bool(row['is_admin']),
-                        is_blocked=bool(row['is_blocked']),
-                        created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now()
-                    )
+                    return self._row_to_user(row)
                 return None
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with _connect(self.db_path) as db:
             async with db.execute("SELECT * FROM users WHERE username = ?", (username,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return User(
-                        user_id=row['user_id'],
-                        username=row['username'],
-                        telegram_username=row['telegram_username'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        display_name=row['display_name'],
-                        is_admin=bool(row['is_admin']),
-                        is_blocked=bool(row['is_blocked']),
-                        created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now()
-                    )
+                    return self._row_to_user(row)
                 return None
 
     async def update_user_status(self, user_id: int, is_blocked: bool) -> bool:
         """Update user blocked status"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("UPDATE users SET is_blocked = ? WHERE user_id = ?", (is_blocked, user_id))
-                await db.commit()
-                return True
-        except Exception:
+            async with _transaction(self.db_path) as db:
+                cursor = await db.execute("UPDATE users SET is_blocked = ? WHERE user_id = ?", (is_blocked, user_id))
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update status of user {user_id}: {e}")
             return False
+        finally:
+            self._cache.invalidate(user_id)
 
     async def get_all_users(self) -> List[User]:
         """Get all users"""
-        users = []
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        return [user async for user in self.iter_all_users()]
+
+    async def iter_all_users(self) -> AsyncIterator[User]:
+        """Yield all users, newest first, without loading the whole table at once"""
+        async with _connect(self.db_path) as db:
             async with db.execute("SELECT * FROM users ORDER BY created_at DESC") as cursor:
                 async for row in cursor:
-                    users.append(User(
-                        user_id=row['user_id'],
-                        username=row['username'],
-                        telegram_username=row['telegram_username'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        display_name=row['display_name'],
-                        is_admin=bool(row['is_admin']),
-                        is_blocked=bool(row['is_blocked']),
-                        created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now()
-                    ))
+                    yield self._row_to_user(row)
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Get several users by ID with one query for those not in cache"""
+        users = {}
+        missing = []
+        for user_id in set(user_ids):
+            user = self._cache.get(user_id)
+            if user is None:
+                missing.append(user_id)
+            else:
+                users[user_id] = user
+
+        generation = self._cache.generation
+        async with _connect(self.db_path) as db:
+            for i in range(0, len(missing), 500):  # Stay well under SQLite's bound-parameter limit
+                chunk = missing[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                async with db.execute(f"SELECT * FROM users WHERE user_id IN ({placeholders})", chunk) as cursor:
+                    async for row in cursor:
+                        user = self._row_to_user(row)
+                        self._cache.set(user.user_id, user, generation)
+                        users[user.user_id] = user
         return users
 
+    @staticmethod
+    def _row_to_user(row) -> User:
+        """Build a User from a users row"""
+        return User(
+            user_id=row['user_id'],
+            username=row['username'],
+            telegram_username=row['telegram_username'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            display_name=row['display_name'],
+            is_admin=bool(row['is_admin']),
+            is_blocked=bool(row['is_blocked']),
+            created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now()
+        )
+
 
 class SQLiteAuctionRepository(AuctionRepository):
     """SQLite implementation of auction repository"""
     
     def __init__(self, db_path: str = "auction.db"):
         self.db_path = db_path
+        self._cache = _LRUCache(maxsize=128, ttl=60)
+        self._active_ids = _LRUCache(maxsize=1, ttl=60)  # Ids of active auctions, dropped on status changes
 
     async def init_db(self):
         """Initialize auction and bid tables"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with _transaction(self.db_path) as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS auctions (
                     auction_id TEXT PRIMARY KEY,
@@ -199,10 +368,21 @@ class SQLiteAuctionRepository(AuctionRepository):
                     duration_hours INTEGER DEFAULT 0,
                     end_time TIMESTAMP,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    version INTEGER NOT NULL DEFAULT 0,
                     FOREIGN KEY (creator_id) REFERENCES users (user_id)
                 )
             """)
             
+            # Databases created before optimistic locking lack the version column
+            async with db.execute("PRAGMA table_info(auctions)") as cursor:
+                columns = [row[1] async for row in cursor]
+            if 'version' not in columns:
+                await db.execute("ALTER TABLE auctions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            
+            # Status checks, next due times and the scheduler tick are answered from these indexes
+            await db.execute("CREATE INDEX IF NOT EXISTS ix_auctions_status_end ON auctions (status, end_time)")
+            await db.execute("CREATE INDEX IF NOT EXISTS ix_auctions_status_created ON auctions (status, created_at)")
+            
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS bids (
                     bid_id TEXT PRIMARY KEY,
@@ -216,6 +396,10 @@ class SQLiteAuctionRepository(AuctionRepository):
                 )
             """)
             
+            # Leader and per-user best bid lookups seek these instead of scanning bids
+            await db.execute("CREATE INDEX IF NOT EXISTS ix_bids_auction_amount ON bids (auction_id, amount DESC)")
+            await db.execute("CREATE INDEX IF NOT EXISTS ix_bids_auction_user ON bids (auction_id, user_id)")
+            
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS auction_participants (
                     auction_id TEXT NOT NULL,
@@ -226,35 +410,60 @@ class SQLiteAuctionRepository(AuctionRepository):
                     FOREIGN KEY (user_id) REFERENCES users (user_id)
                 )
             """)
-            
-            await db.commit()
 
     async def create_auction(self, auction: Auction) -> UUID:
         """Create a new auction"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with _transaction(self.db_path) as db:
             await db.execute("""
                 INSERT INTO auctions (auction_id, title, description, start_price, current_price, status, creator_id, photo_url, media_type, custom_message, duration_hours, end_time, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (str(auction.auction_id), auction.title, auction.description, auction.start_price, auction.current_price, auction.status.value, auction.creator_id, auction.photo_url, auction.media_type, auction.custom_message, auction.duration_hours, auction.end_time, auction.created_at))
-            await db.commit()
-            return auction.auction_id
+        self._active_ids.invalidate(AuctionStatus.ACTIVE)
+        return auction.auction_id
 
     async def get_auction(self, auction_id: UUID) -> Optional[Auction]:
-        """Get auction by ID with all related data"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
+        """Get auction by ID with all related data, served from cache when possible"""
+        auction = self._cache.get(auction_id)
+        if auction is None:
+            generation = self._cache.generation
+            auction = await self._load_auction(auction_id)
+            if not auction:
+                return None
+            self._cache.set(auction_id, auction, generation)
+        return self._copy_auction(auction)
+
+    @staticmethod
+    def _copy_auction(auction: Auction) -> Auction:
+        """Give the caller its own Auction so changes to it never leak into the shared cache"""
+        return replace(
+            auction,
+            participants=set(auction.participants),
+            participant_names=dict(auction.participant_names),
+            bids=list(auction.bids)
+        )
+
+    async def _load_auction(self, auction_id: UUID) -> Optional[Auction]:
+        """Load auction with participants and bids from the database"""
+        async with _connect(self.db_path) as db:
             # Get auction data
             async with db.execute("SELECT * FROM auctions WHERE auction_id = ?", (str(auction_id),)) as cursor:
                 auction_row = await cursor.fetchone()
                 if not auction_row:
                     return None
             
-            # Get participants
+            # Get participants, keeping usernames of those allowed to bid
             participants = set()
-            async with db.execute("SELECT user_id FROM auction_participants WHERE auction_id = ?", (str(auction_id),)) as cursor:
+            participant_names = {}
+            async with db.execute("""
+                SELECT p.user_id, u.username, u.is_blocked
+                FROM auction_participants p
+                LEFT JOIN users u ON u.user_id = p.user_id
+                WHERE p.auction_id = ?
+            """, (str(auction_id),)) as cursor:
                 async for row in cursor:
                     participants.add(row['user_id'])
+                    if row['username'] is not None and not row['is_blocked']:
+                        participant_names[row['user_id']] = row['username']
             
             # Get bids
             bids = []
@@ -272,107 +481,272 @@ class SQLiteAuctionRepository(AuctionRepository):
             # Find current leader
             current_leader = bids[-1] if bids else None
             
-            return Auction(
-                auction_id=UUID(auction_row['auction_id']),
-                title=auction_row['title'],
-                description=auction_row['description'],
-                start_price=auction_row['start_price'],
-                current_price=auction_row['current_price'],
-                status=AuctionStatus(auction_row['status']),
-                creator_id=auction_row['creator_id'],
-                photo_url=auction_row['photo_url'],
-                media_type=auction_row['media_type'] or 'photo',
-                custom_message=auction_row['custom_message'],
-                duration_hours=auction_row['duration_hours'] or 0,
-                end_time=datetime.fromisoformat(auction_row['end_time']) if auction_row['end_time'] else None,
-                created_at=datetime.fromisoformat(auction_row['created_at']) if auction_row['created_at'] else datetime.now(),
+            return self._row_to_auction(
+                auction_row,
                 participants=participants,
+                participant_names=participant_names,
                 bids=bids,
                 current_leader=current_leader
             )
 
+    @staticmethod
+    def _row_to_auction(row, **related) -> Auction:
+        """Build an Auction from an auctions row plus any related data"""
+        return Auction(
+            auction_id=UUID(row['auction_id']),
+            title=row['title'],
+            description=row['description'],
+            start_price=row['start_price'],
+            current_price=row['current_price'],
+            status=AuctionStatus(row['status']),
+            creator_id=row['creator_id'],
+            photo_url=row['photo_url'],
+            media_type=row['media_type'] or 'photo',
+            custom_message=row['custom_message'],
+            duration_hours=row['duration_hours'] or 0,
+            end_time=datetime.fromisoformat(row['end_time']) if row['end_time'] else None,
+            created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now(),
+            version=row['version'],
+            **related
+        )
+
     async def update_auction_status(self, auction_id: UUID, status: AuctionStatus) -> bool:
         """Update auction status"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("UPDATE auctions SET status = ? WHERE auction_id = ?", (status.value, str(auction_id)))
-                await db.commit()
-                return True
-        except Exception:
+            async with _transaction(self.db_path) as db:
+                cursor = await db.execute("UPDATE auctions SET status = ?, version = version + 1 WHERE auction_id = ?", (status.value, str(auction_id)))
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update status of auction {auction_id}: {e}")
+            return False
+        finally:
+            self._cache.invalidate(auction_id)
+            self._active_ids.invalidate(AuctionStatus.ACTIVE)
+
+    async def activate_auction(self, auction_id: UUID, end_time: Optional[datetime]) -> bool:
+        """Mark auction active and set its end time"""
+        try:
+            async with _transaction(self.db_path) as db:
+                cursor = await db.execute(
+                    "UPDATE auctions SET status = ?, end_time = ?, version = version + 1 WHERE auction_id = ?",
+                    (AuctionStatus.ACTIVE.value, end_time, str(auction_id))
+                )
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logging.error(f"Failed to activate auction {auction_id}: {e}")
+            return False
+        finally:
+            self._cache.invalidate(auction_id)
+            self._active_ids.invalidate(AuctionStatus.ACTIVE)
+
+    async def update_auction_media(self, auction_id: UUID, photo_url: str) -> bool:
+        """Replace auction media reference, e.g. a URL with the Telegram file_id it was uploaded as"""
+        try:
+            async with _transaction(self.db_path) as db:
+                cursor = await db.execute("UPDATE auctions SET photo_url = ? WHERE auction_id = ?", (photo_url, str(auction_id)))
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update media of auction {auction_id}: {e}")
             return False
+        finally:
+            self._cache.invalidate(auction_id)
 
     async def get_active_auctions(self) -> List[Auction]:
-        """Get all active auctions"""
-        auctions = []
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT auction_id FROM auctions WHERE status = ? ORDER BY created_at", (AuctionStatus.ACTIVE.value,)) as cursor:
+        """Get all active auctions, reusing the id list until an auction changes status"""
+        auction_ids = self._active_ids.get(AuctionStatus.ACTIVE)
+        if auction_ids is None:
+            generation = self._active_ids.generation
+            async with _connect(self.db_path) as db:
+                async with db.execute("SELECT auction_id FROM auctions WHERE status = ? ORDER BY created_at", (AuctionStatus.ACTIVE.value,)) as cursor:
+                    auction_ids = [UUID(row['auction_id']) async for row in cursor]
+            self._active_ids.set(AuctionStatus.ACTIVE, auction_ids, generation)
+        
+        return await self._get_auctions(auction_ids)
+
+    async def get_auction_summaries(self, status: AuctionStatus) -> List[AuctionSummary]:
+        """Get summaries of auctions in a status, oldest first, without loading bids"""
+        summaries = []
+        async with _connect(self.db_path) as db:
+            async with db.execute("""
+                SELECT auction_id, title, status, current_price, created_at, end_time
+                FROM auctions
+                WHERE status = ?
+                ORDER BY created_at
+            """, (status.value,)) as cursor:
                 async for row in cursor:
-                    auction = await self.get_auction(UUID(row['auction_id']))
-                    if auction:
-                        auctions.append(auction)
-        return auctions
+                    summaries.append(AuctionSummary(
+                        auction_id=UUID(row['auction_id']),
+                        title=row['title'],
+                        status=AuctionStatus(row['status']),
+                        current_price=row['current_price'],
+                        created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now(),
+                        end_time=datetime.fromisoformat(row['end_time']) if row['end_time'] else None
+                    ))
+        return summaries
+
+    async def has_active_auction(self) -> bool:
+        """Check whether any auction is active without loading it"""
+        async with _connect(self.db_path) as db:
+            async with db.execute("SELECT 1 FROM auctions WHERE status = ? LIMIT 1", (AuctionStatus.ACTIVE.value,)) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def tick(self, now: datetime, activation_delay: timedelta) -> Tuple[List[Auction], Optional[Auction]]:
+        """Complete expired auctions and pick the scheduled auction due to start, in one transaction"""
+        expired_ids = []
+        try:
+            async with _transaction(self.db_path) as db:
+                async with db.execute("""
+                    UPDATE auctions SET status = ?, version = version + 1
+                    WHERE status = ? AND end_time IS NOT NULL AND end_time <= ?
+                    RETURNING auction_id
+                """, (AuctionStatus.COMPLETED.value, AuctionStatus.ACTIVE.value, now)) as cursor:
+                    expired_ids = [UUID(row['auction_id']) for row in await cursor.fetchall()]
+                
+                async with db.execute("""
+                    SELECT auction_id FROM auctions
+                    WHERE status = ? AND created_at <= ?
+                      AND NOT EXISTS (SELECT 1 FROM auctions WHERE status = ?)
+                    ORDER BY created_at
+                    LIMIT 1
+                """, (AuctionStatus.SCHEDULED.value, now - activation_delay, AuctionStatus.ACTIVE.value)) as cursor:
+                    row = await cursor.fetchone()
+                    next_id = UUID(row['auction_id']) if row else None
+        finally:
+            for auction_id in expired_ids:
+                self._cache.invalidate(auction_id)
+            if expired_ids:
+                self._active_ids.invalidate(AuctionStatus.ACTIVE)
+        
+        expired = [auction for auction in [await self.get_auction(auction_id) for auction_id in expired_ids] if auction]
+        next_auction = await self.get_auction(next_id) if next_id else None
+        return expired, next_auction
+
+    async def get_next_end_time(self) -> Optional[datetime]:
+        """Get the earliest end time among active auctions"""
+        async with _connect(self.db_path) as db:
+            async with db.execute("SELECT MIN(end_time) FROM auctions WHERE status = ?", (AuctionStatus.ACTIVE.value,)) as cursor:
+                row = await cursor.fetchone()
+                return datetime.fromisoformat(row[0]) if row[0] else None
+
+    async def get_next_scheduled_created_at(self) -> Optional[datetime]:
+        """Get creation time of the scheduled auction next in line"""
+        async with _connect(self.db_path) as db:
+            async with db.execute("SELECT MIN(created_at) FROM auctions WHERE status = ?", (AuctionStatus.SCHEDULED.value,)) as cursor:
+                row = await cursor.fetchone()
+                return datetime.fromisoformat(row[0]) if row[0] else None
+
+    async def get_user_participation(self, user_id: int) -> List[AuctionParticipation]:
+        """Get the user's best bid and leader flag in each active auction they joined"""
+        participation = []
+        async with _connect(self.db_path) as db:
+            async with db.execute("""
+                SELECT a.auction_id, a.title, a.current_price, a.end_time,
+                       ub.bid_id AS user_bid_id, ub.username AS user_bid_username,
+                       ub.amount AS user_bid_amount, ub.timestamp AS user_bid_timestamp,
+                       lb.user_id AS leader_user_id
+                FROM auctions a
+                JOIN auction_participants p ON p.auction_id = a.auction_id AND p.user_id = ?
+                LEFT JOIN bids ub ON ub.bid_id = (
+                    SELECT bid_id FROM bids WHERE auction_id = a.auction_id AND user_id = ?
+                    ORDER BY amount DESC LIMIT 1
+                )
+                LEFT JOIN bids lb ON lb.bid_id = (
+                    SELECT bid_id FROM bids WHERE auction_id = a.auction_id
+                    ORDER BY amount DESC LIMIT 1
+                )
+                WHERE a.status = ?
+                ORDER BY a.created_at
+            """, (user_id, user_id, AuctionStatus.ACTIVE.value)) as cursor:
+                async for row in cursor:
+                    auction_id = UUID(row['auction_id'])
+                    user_bid = None
+                    if row['user_bid_id']:
+                        user_bid = Bid(
+                            bid_id=UUID(row['user_bid_id']),
+                            auction_id=auction_id,
+                            user_id=user_id,
+                            username=row['user_bid_username'],
+                            amount=row['user_bid_amount'],
+                            timestamp=datetime.fromisoformat(row['user_bid_timestamp']) if row['user_bid_timestamp'] else datetime.now()
+                        )
+                    participation.append(AuctionParticipation(
+                        auction_id=auction_id,
+                        title=row['title'],
+                        current_price=row['current_price'],
+                        end_time=datetime.fromisoformat(row['end_time']) if row['end_time'] else None,
+                        user_bid=user_bid,
+                        is_leader=row['leader_user_id'] == user_id
+                    ))
+        return participation
 
     async def get_scheduled_auctions(self) -> List[Auction]:
         """Get all scheduled auctions"""
-        auctions = []
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with _connect(self.db_path) as db:
             async with db.execute("SELECT auction_id FROM auctions WHERE status = ? ORDER BY created_at", (AuctionStatus.SCHEDULED.value,)) as cursor:
-                async for row in cursor:
-                    auction = await self.get_auction(UUID(row['auction_id']))
-                    if auction:
-                        auctions.append(auction)
-        return auctions
+                auction_ids = [UUID(row['auction_id']) async for row in cursor]
+        return await self._get_auctions(auction_ids)
 
     async def get_completed_auctions(self) -> List[Auction]:
         """Get all completed auctions"""
-        auctions = []
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with _connect(self.db_path) as db:
             async with db.execute("SELECT auction_id FROM auctions WHERE status = ? ORDER BY created_at DESC LIMIT 10", (AuctionStatus.COMPLETED.value,)) as cursor:
-                async for row in cursor:
-                    auction = await self.get_auction(UUID(row['auction_id']))
-                    if auction:
-                        auctions.append(auction)
+                auction_ids = [UUID(row['auction_id']) async for row in cursor]
+        return await self._get_auctions(auction_ids)
+
+    async def _get_auctions(self, auction_ids: List[UUID]) -> List[Auction]:
+        """Load auctions by id once the cursor that listed them is closed"""
+        auctions = []
+        for auction_id in auction_ids:
+            auction = await self.get_auction(auction_id)
+            if auction:
+                auctions.append(auction)
         return auctions
 
     async def add_participant(self, auction_id: UUID, user_id: int) -> bool:
         """Add participant to auction"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with _transaction(self.db_path) as db:
                 await db.execute("""
                     INSERT OR IGNORE INTO auction_participants (auction_id, user_id)
                     VALUES (?, ?)
                 """, (str(auction_id), user_id))
-                await db.commit()
                 return True
-        except Exception:
+        except sqlite3.Error as e:
+            logging.error(f"Failed to add user {user_id} to auction {auction_id}: {e}")
             return False
+        finally:
+            self._cache.invalidate(auction_id)
+
+    async def invalidate_participant(self, user_id: int) -> None:
+        """Drop cached auctions the user joined after their details or blocked status changed"""
+        self._cache.invalidate_where(lambda auction: user_id in auction.participants)
 
-    async def add_bid(self, bid: Bid) -> bool:
-        """Add bid to auction and update current price"""
+    async def add_bid(self, bid: Bid, expected_version: int) -> bool:
+        """Add bid and update current price; False only if the auction changed since it was read"""
+        # Database errors propagate so they are never mistaken for a lost race
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with _transaction(self.db_path) as db:
+                # Update auction current price only if nobody else got there first
+                cursor = await db.execute("""
+                    UPDATE auctions SET current_price = ?, version = version + 1
+                    WHERE auction_id = ? AND version = ?
+                """, (bid.amount, str(bid.auction_id), expected_version))
+                if cursor.rowcount == 0:
+                    return False
+                
                 # Add bid
                 await db.execute("""
                     INSERT INTO bids (bid_id, auction_id, user_id, username, amount, timestamp)
                     VALUES (?, ?, ?, ?, ?, ?)
                 """, (str(bid.bid_id), str(bid.auction_id), bid.user_id, bid.username, bid.amount, bid.timestamp))
-                
-                # Update auction current price
-                await db.execute("UPDATE auctions SET current_price = ? WHERE auction_id = ?", (bid.amount, str(bid.auction_id)))
-                
-                await db.commit()
                 return True
-        except Exception:
-            return False
+        finally:
+            self._cache.invalidate(bid.auction_id)
 
     async def get_auction_bids(self, auction_id: UUID) -> List[Bid]:
         """Get all bids for an auction"""
         bids = []
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with _connect(self.db_path) as db:
             async with db.execute("SELECT * FROM bids WHERE auction_id = ? ORDER BY timestamp", (str(auction_id),)) as cursor:
                 async for row in cursor:
                     bids.append(Bid(
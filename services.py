@@ -3,12 +3,18 @@ Application services containing business logic
 """
 
 import asyncio
+import functools
+import html
 import logging
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID, uuid4
 
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter
+
 from domain import User, Auction, Bid, AuctionStatus
 from repositories import UserRepository, AuctionRepository
 
@@ -16,10 +22,17 @@ from repositories import UserRepository, AuctionRepository
 class AuctionService:
     """Main auction business logic service"""
     
+    BID_ATTEMPTS = 3  # Retries when a concurrent write changes the auction mid-bid
+    
     def __init__(self, user_repo: UserRepository, auction_repo: AuctionRepository, notification_service=None):
         self.user_repo = user_repo
         self.auction_repo = auction_repo
         self.notification_service = notification_service
+        self.scheduler = None  # Will be injected
+        self._admin_ids = frozenset(
+            int(admin_id) for admin_id in os.getenv('ADMIN_IDS', '').split(',')
+            if admin_id.strip().isdigit()
+        )
 
     async def register_user(self, user_id: int, username: str, telegram_username: Optional[str] = None, 
                            first_name: Optional[str] = None, last_name: Optional[str] = None) -> bool:
@@ -28,8 +41,7 @@ class AuctionService:
         if existing_user:
             return False
         
-        admin_ids = os.getenv('ADMIN_IDS', '').split(',')
-        is_admin = str(user_id) in admin_ids
+        is_admin = user_id in self._admin_ids
         
         user = User(
             user_id=user_id,
@@ -40,7 +52,19 @@ class AuctionService:
             is_admin=is_admin
         )
         
-        return await self.user_repo.create_user(user)
+        created = await self.user_repo.create_user(user)
+        if created and self.notification_service:
+            self.notification_service.invalidate_recipients()
+        return created
+
+    async def set_user_blocked(self, user_id: int, is_blocked: bool) -> bool:
+        """Block or unblock a user"""
+        success = await self.user_repo.update_user_status(user_id, is_blocked)
+        # Cached auctions list who may bid; reload them so the new status applies
+        await self.auction_repo.invalidate_participant(user_id)
+        if self.notification_service:
+            self.notification_service.invalidate_recipients()
+        return success
 
     async def create_auction(self, creator_id: int, title: str, start_price: float, 
                            duration_hours: int, description: Optional[str] = None,
@@ -48,18 +72,17 @@ class AuctionService:
                            custom_message: Optional[str] = None) -> UUID:
         """Create a new auction - active if no active auctions, scheduled otherwise"""
         auction_id = uuid4()
+        now = datetime.now()
         
         # Check if there are active auctions
-        active_auctions = await self.auction_repo.get_active_auctions()
-        
-        if active_auctions:
+        if await self.auction_repo.has_active_auction():
             # Schedule auction
             status = AuctionStatus.SCHEDULED
             end_time = None
         else:
             # Start immediately
             status = AuctionStatus.ACTIVE
-            end_time = datetime.now() + timedelta(hours=duration_hours) if duration_hours > 0 else None
+            end_time = now + timedelta(hours=duration_hours) if duration_hours > 0 else None
         
         auction = Auction(
             auction_id=auction_id,
@@ -73,10 +96,16 @@ class AuctionService:
             media_type=media_type,
             custom_message=custom_message,
             duration_hours=duration_hours,
-            end_time=end_time
+            end_time=end_time,
+            created_at=now
         )
         
         await self.auction_repo.create_auction(auction)
+        self._wake_scheduler()
+        
+        if status == AuctionStatus.ACTIVE and self.notification_service:
+            await self.notification_service.notify_auction_started(auction)
+        
         return auction_id
 
     async def activate_scheduled_auction(self, auction_id: UUID) -> bool:
@@ -86,14 +115,18 @@ class AuctionService:
             return False
         
         # Update status to active and set end time
-        auction.status = AuctionStatus.ACTIVE
+        end_time = auction.end_time
         if auction.duration_hours > 0:
-            auction.end_time = datetime.now() + timedelta(hours=auction.duration_hours)
+            end_time = datetime.now() + timedelta(hours=auction.duration_hours)
         
-        success = await self.auction_repo.update_auction_status(auction_id, AuctionStatus.ACTIVE)
+        success = await self.auction_repo.activate_auction(auction_id, end_time)
+        if success:
+            self._wake_scheduler()
         
         if success and self.notification_service:
-            await self.notification_service.notify_auction_started(auction)
+            auction = await self.auction_repo.get_auction(auction_id)
+            if auction:
+                await self.notification_service.notify_auction_started(auction)
         
         return success
 
@@ -104,8 +137,8 @@ class AuctionService:
 
     async def get_next_scheduled_auction(self) -> Optional[Auction]:
         """Get the next scheduled auction"""
-        scheduled_auctions = await self.auction_repo.get_scheduled_auctions()
-        return scheduled_auctions[0] if scheduled_auctions else None
+        scheduled_auctions = await self.auction_repo.get_auction_summaries(AuctionStatus.SCHEDULED)
+        return await self.auction_repo.get_auction(scheduled_auctions[0].auction_id) if scheduled_auctions else None
 
     async def join_auction(self, auction_id: UUID, user_id: int) -> bool:
         """Join an auction as participant"""
@@ -117,47 +150,61 @@ class AuctionService:
         if not user or user.is_blocked:
             return False
         
+        # Only hit the database when the user is new here; the write invalidates the cached auction
+        if user_id in auction.participants:
+            return True
+        
         return await self.auction_repo.add_participant(auction_id, user_id)
 
     async def place_bid(self, auction_id: UUID, user_id: int, amount: float) -> bool:
         """Place a bid on an auction"""
-        auction = await self.auction_repo.get_auction(auction_id)
-        if not auction or not auction.is_active:
-            return False
-        
-        user = await self.user_repo.get_user(user_id)
-        if not user or user.is_blocked:
-            return False
-        
-        if user_id not in auction.participants:
-            return False
-        
-        if amount <= auction.current_price:
+        # Optimistic locking: re-validate against fresh data if another write won the race
+        for _ in range(self.BID_ATTEMPTS):
+            auction = await self.auction_repo.get_auction(auction_id)
+            if not auction or not auction.is_active:
+                return False
+            
+            if user_id not in auction.participants:
+                return False
+            
+            # Usernames are cached at join time; look the user up only if they are missing
+            username = auction.participant_names.get(user_id)
+            if username is None:
+                user = await self.user_repo.get_user(user_id)
+                if not user or user.is_blocked:
+                    return False
+                username = user.username
+            
+            if amount <= auction.current_price:
+                return False
+            
+            # Remember previous leader
+            previous_leader = auction.current_leader
+            
+            bid = Bid(
+                bid_id=uuid4(),
+                auction_id=auction_id,
+                user_id=user_id,
+                username=username,
+                amount=amount
+            )
+            
+            if await self.auction_repo.add_bid(bid, auction.version):
+                break
+        else:
             return False
         
-        # Remember previous leader
-        previous_leader = auction.current_leader
+        # get_auction hands out a private copy, and the version check proves nothing else changed it,
+        # so recording the bid locally is equivalent to re-reading the auction
+        auction.apply_bid(bid)
         
-        bid = Bid(
-            bid_id=uuid4(),
-            auction_id=auction_id,
-            user_id=user_id,
-            username=user.username,
-            amount=amount
-        )
-        
-        success = await self.auction_repo.add_bid(bid)
-        
-        if success and self.notification_service:
-            # Get updated auction data
-            updated_auction = await self.auction_repo.get_auction(auction_id)
-            if updated_auction:
-                await self.notification_service.notify_bid_placed(updated_auction, bid)
-                
-                if previous_leader and previous_leader.user_id != user_id:
-                    await self.notification_service.notify_bid_overtaken(updated_auction, previous_leader.user_id, bid)
+        if self.notification_service:
+            await self.notification_service.notify_bid_placed(auction, bid)
+            
+            if previous_leader and previous_leader.user_id != user_id:
+                await self.notification_service.notify_bid_overtaken(auction, previous_leader.user_id, bid)
         
-        return success
+        return True
 
     async def end_auction(self, auction_id: UUID, admin_id: int) -> bool:
         """End an auction manually"""
@@ -170,6 +217,8 @@ class AuctionService:
             return False
         
         success = await self.auction_repo.update_auction_status(auction_id, AuctionStatus.COMPLETED)
+        if success:
+            self._wake_scheduler()
         
         if success and self.notification_service:
             updated_auction = await self.auction_repo.get_auction(auction_id)
@@ -184,80 +233,227 @@ class AuctionService:
         if not user:
             return {"registered": False}
         
-        auctions = await self.auction_repo.get_active_auctions()
-        participating_in = []
-        
-        for auction in auctions:
-            if user_id in auction.participants:
-                user_bid = None
-                for bid in auction.bids:
-                    if bid.user_id == user_id:
-                        if not user_bid or bid.amount > user_bid.amount:
-                            user_bid = bid
-                
-                participating_in.append({
-                    "auction": auction,
-                    "user_bid": user_bid,
-                    "is_leader": auction.current_leader and auction.current_leader.user_id == user_id
-                })
-        
         return {
             "registered": True,
             "user": user,
-            "participating_in": participating_in
+            "participating_in": await self.auction_repo.get_user_participation(user_id)
         }
 
+    def _wake_scheduler(self) -> None:
+        """Let the scheduler recompute its next wakeup after auction timing changed"""
+        if self.scheduler:
+            self.scheduler.wake()
+
+
+@functools.lru_cache(maxsize=256)
+def auction_keyboard(auction_id: UUID, is_participant: bool = False) -> InlineKeyboardMarkup:
+    """Generate auction inline keyboard; markups are immutable and shared between messages"""
+    keyboard = []
+    
+    if not is_participant:
+        keyboard.append([InlineKeyboardButton("✅ Участвовать", callback_data=f"join_{auction_id}")])
+    else:
+        keyboard.append([InlineKeyboardButton("💸 Перебить ставку", callback_data=f"bid_{auction_id}")])
+    
+    keyboard.append([InlineKeyboardButton("ℹ️ Обновить статус", callback_data=f"status_{auction_id}")])
+    keyboard.append([InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")])
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+class BroadcastQueue:
+    """Outgoing Telegram message queue that respects API rate limits"""
+    
+    def __init__(self, bot, rate_limit: int = 30, workers: int = 20):
+        self.bot = bot
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._interval = 1 / rate_limit  # Telegram allows ~30 messages per second overall
+        self._workers = workers
+        self._worker_tasks: List[asyncio.Task] = []
+        self._next_slot = 0.0
+        self._slot_lock = asyncio.Lock()
+
+    async def enqueue(self, chat_id: int, text: str, reply_markup=None, parse_mode: Optional[str] = None) -> None:
+        """Queue a text message for delivery"""
+        await self.enqueue_calls(chat_id, [
+            ('send_message', {'text': text, 'reply_markup': reply_markup, 'parse_mode': parse_mode})
+        ])
+
+    async def enqueue_calls(self, chat_id: int, calls: List[Tuple[str, Dict]]) -> None:
+        """Queue bot API calls (method name, kwargs) that must reach a chat in order"""
+        await self._queue.put((chat_id, calls))
+
+    async def broadcast(self, chat_ids: Iterable[int], calls: List[Tuple[str, Dict]]) -> None:
+        """Queue the same calls for many chats; the payload is built once and shared"""
+        for chat_id in chat_ids:
+            await self.enqueue_calls(chat_id, calls)
+
+    async def send_now(self, chat_id: int, calls: List[Tuple[str, Dict]]) -> List:
+        """Perform calls for one chat immediately, within the rate limit, returning their results"""
+        results = []
+        for method, kwargs in calls:
+            while True:
+                await self._wait_for_slot()
+                try:
+                    results.append(await getattr(self.bot, method)(chat_id=chat_id, **kwargs))
+                    break
+                except RetryAfter as e:
+                    self._pause(e.retry_after)
+        return results
+
+    def start(self) -> None:
+        """Start delivery workers"""
+        if not self._worker_tasks:
+            self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    async def stop(self) -> None:
+        """Cancel delivery workers"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def _worker(self) -> None:
+        """Drain the queue, delivering each chat's calls in order"""
+        while True:
+            chat_id, calls = await self._queue.get()
+            try:
+                # Flood control is waited out in place, so a chat's messages never overtake each other
+                await self.send_now(chat_id, calls)
+            except Exception as e:
+                logging.error(f"Failed to notify user {chat_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _pause(self, retry_after: float) -> None:
+        """Hold back all sends for the period Telegram asked for"""
+        logging.warning(f"Flood control hit, pausing broadcasts for {retry_after}s")
+        self._next_slot = max(self._next_slot, asyncio.get_running_loop().time() + retry_after)
+
+    async def _wait_for_slot(self) -> None:
+        """Space out requests to stay under the global rate limit"""
+        now = asyncio.get_running_loop().time()
+        async with self._slot_lock:
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
 
 class TelegramNotificationService:
     """Telegram-specific notification implementation"""
     
+    RECIPIENTS_TTL = 30  # Seconds a broadcast recipient list is reused
+    MEDIA_METHODS = {'photo': 'send_photo', 'video': 'send_video', 'animation': 'send_animation'}
+    CAPTION_LIMIT = 1024  # Telegram limits for media captions and text messages
+    TEXT_LIMIT = 4096
+    UPLOAD_ATTEMPTS = 3  # Recipients tried for the one-off upload of URL media
+    BID_TEMPLATE = "🔥 Новая ставка в аукционе <b>{title}</b>\n\n👤 {username} — <b>{amount:,.0f}₽</b>"
+    LEAD_TEMPLATE = "✅ Ваша ставка <b>{amount:,.0f}₽</b> теперь лидирует в аукционе <b>{title}</b>!"
+    OVERTAKEN_TEMPLATE = ("😔 Вашу ставку перебили в аукционе <b>{title}</b>\n\n"
+                          "Новый лидер: {username} — <b>{amount:,.0f}₽</b>")
+    BIDS_TEMPLATE = "🔥 Новые ставки в аукционе <b>{title}</b>\n\n{lines}\n\n💰 Текущая цена: <b>{amount:,.0f}₽</b>"
+    BID_LINE_TEMPLATE = "👤 {username} — <b>{amount:,.0f}₽</b>"
+    BID_WINDOW = 2  # Seconds new bids are collected before participants are told about them
+    BID_LINES = 5  # Most recent bids listed in a combined notification
+    
     def __init__(self, application):
         self.application = application
         self.user_repo = None  # Will be injected
+        self.auction_repo = None  # Will be injected
+        self.queue = BroadcastQueue(application.bot, workers=int(os.getenv('TG_CONCURRENCY', '32')))
+        broadcast_chat_id = os.getenv('BROADCAST_CHAT_ID')
+        self.broadcast_chat_id = int(broadcast_chat_id) if broadcast_chat_id else None  # Source channel for copies
+        self._msg_cache: Dict[UUID, Tuple[tuple, str]] = {}  # auction_id -> (version key, message body)
+        self._leader_names: Dict[Tuple[UUID, int], str] = {}  # (auction_id, user_id) -> display name
+        self._recipients: Optional[Tuple[float, List[int]]] = None  # (loaded at, chat ids)
+        self._recipients_generation = 0
+        self._pending_bids: Dict[UUID, List[Bid]] = {}  # auction_id -> bids not yet announced
+        self._pending_bid_flush: Dict[UUID, asyncio.Task] = {}
+
+    def invalidate_recipients(self) -> None:
+        """Drop cached recipients and user names after a user is added or (un)blocked"""
+        self._recipients = None
+        self._recipients_generation += 1
+        # Cached cards embed leader names, so they go along with the names themselves
+        self._leader_names.clear()
+        self._msg_cache.clear()
+
+    async def _get_recipients(self) -> List[int]:
+        """Chat ids of non-blocked, non-admin users, cached for RECIPIENTS_TTL seconds"""
+        now = time.monotonic()
+        if self._recipients and now - self._recipients[0] < self.RECIPIENTS_TTL:
+            return self._recipients[1]
+        
+        generation = self._recipients_generation
+        recipients = [
+            user.user_id async for user in self.user_repo.iter_all_users()
+            if not user.is_blocked and not user.is_admin
+        ]
+        if generation == self._recipients_generation:
+            self._recipients = (now, recipients)
+        return recipients
 
     async def notify_bid_placed(self, auction: Auction, new_bid: Bid) -> None:
-        """Notify participants about new bid"""
-        message = f"🔥 Новая ставка в аукционе *{auction.title}*\n\n"
-        message += f"👤 {new_bid.username} — *{new_bid.amount:,.0f}₽*"
+        """Confirm the bid to its author now and tell other participants in the next batch"""
+        # Notify bid author first so the confirmation isn't queued behind the fan-out
+        await self.queue.enqueue(
+            new_bid.user_id,
+            self.LEAD_TEMPLATE.format(title=html.escape(auction.title), amount=new_bid.amount),
+            parse_mode='HTML'
+        )
         
-        # Notify all participants except bid author
-        for participant_id in auction.participants:
-            if participant_id != new_bid.user_id:
-                try:
-                    await self.application.bot.send_message(
-                        chat_id=participant_id,
-                        text=message,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logging.error(f"Failed to notify user {participant_id}: {e}")
-
-        # Notify bid author
-        try:
-            await self.application.bot.send_message(
-                chat_id=new_bid.user_id,
-                text=f"✅ Ваша ставка *{new_bid.amount:,.0f}₽* теперь лидирует в аукционе *{auction.title}*!",
-                parse_mode='Markdown'
+        self._pending_bids.setdefault(auction.auction_id, []).append(new_bid)
+        if auction.auction_id not in self._pending_bid_flush:
+            self._pending_bid_flush[auction.auction_id] = asyncio.create_task(self._flush_bids(auction.auction_id))
+
+    async def _flush_bids(self, auction_id: UUID) -> None:
+        """After BID_WINDOW, send one message per participant covering all bids collected meanwhile"""
+        await asyncio.sleep(self.BID_WINDOW)
+        self._pending_bid_flush.pop(auction_id, None)
+        bids = self._pending_bids.pop(auction_id)
+        
+        # Participants may have joined or been blocked during the window
+        auction = await self.auction_repo.get_auction(auction_id)
+        if not auction:
+            return
+        
+        title = html.escape(auction.title)
+        latest = bids[-1]
+        if len(bids) == 1:
+            message = self.BID_TEMPLATE.format(title=title, username=html.escape(latest.username), amount=latest.amount)
+        else:
+            lines = "\n".join(
+                self.BID_LINE_TEMPLATE.format(username=html.escape(bid.username), amount=bid.amount)
+                for bid in bids[-self.BID_LINES:]
             )
-        except Exception as e:
-            logging.error(f"Failed to notify bid author {new_bid.user_id}: {e}")
+            message = self.BIDS_TEMPLATE.format(title=title, lines=lines, amount=latest.amount)
+        
+        # The current leader already got a personal confirmation
+        await self.queue.broadcast(
+            auction.participants - {latest.user_id},
+            [('send_message', {'text': message, 'parse_mode': 'HTML'})]
+        )
 
     async def notify_bid_overtaken(self, auction: Auction, overtaken_user_id: int, new_bid: Bid) -> None:
         """Notify user their bid was overtaken"""
-        try:
-            await self.application.bot.send_message(
-                chat_id=overtaken_user_id,
-                text=f"😔 Вашу ставку перебили в аукционе *{auction.title}*\n\n"
-                     f"Новый лидер: {new_bid.username} — *{new_bid.amount:,.0f}₽*",
-                parse_mode='Markdown'
-            )
-        except Exception as e:
-            logging.error(f"Failed to notify overtaken user {overtaken_user_id}: {e}")
+        await self.queue.enqueue(
+            overtaken_user_id,
+            self.OVERTAKEN_TEMPLATE.format(title=html.escape(auction.title), username=html.escape(new_bid.username),
+                                           amount=new_bid.amount),
+            parse_mode='HTML'
+        )
 
     async def notify_auction_ended(self, auction: Auction) -> None:
         """Notify all participants auction ended"""
+        # The final result supersedes any bids still waiting to be announced
+        flush = self._pending_bid_flush.pop(auction.auction_id, None)
+        if flush:
+            flush.cancel()
+        self._pending_bids.pop(auction.auction_id, None)
+        
         winner = auction.current_leader
-        message = f"🏁 Аукцион *{auction.title}* завершён!\n\n"
+        message = f"🏁 Аукцион <b>{html.escape(auction.title)}</b> завершён!\n\n"
         
         if winner:
             # Get winner display name
@@ -267,8 +463,8 @@ class TelegramNotificationService:
             else:
                 winner_name = winner.username
             
-            message += f"🏆 Победитель: {winner_name}\n"
-            message += f"💰 Итоговая ставка: *{winner.amount:,.0f}₽*\n"
+            message += f"🏆 Победитель: {html.escape(winner_name)}\n"
+            message += f"💰 Итоговая ставка: <b>{winner.amount:,.0f}₽</b>\n"
         else:
             message += "❌ Ставок не было\n"
         
@@ -276,173 +472,191 @@ class TelegramNotificationService:
         message += f"📊 Всего ставок: {len(auction.bids)}"
         
         # Notify all participants
-        for participant_id in auction.participants:
-            try:
-                await self.application.bot.send_message(
-                    chat_id=participant_id,
-                    text=message,
-                    parse_mode='Markdown'
-                )
-            except Exception as e:
-                logging.error(f"Failed to notify participant {participant_id}: {e}")
+        await self.queue.broadcast(auction.participants, [('send_message', {'text': message, 'parse_mode': 'HTML'})])
+        
+        # Auction is over, its cached message and leader names won't be shown again
+        self._msg_cache.pop(auction.auction_id, None)
+        for key in [key for key in self._leader_names if key[0] == auction.auction_id]:
+            del self._leader_names[key]
 
     async def notify_auction_started(self, auction: Auction) -> None:
         """Notify all users about new auction"""
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-        
-        welcome_msg = auction.custom_message or "🎉 *Новый аукцион начался!*"
-        auction_message = await self._format_auction_message(auction)
-        keyboard = self._get_auction_keyboard(auction.auction_id)
+        welcome_msg = html.escape(auction.custom_message) if auction.custom_message else "🎉 <b>Новый аукцион начался!</b>"
+        auction_message = await self.format_auction_message(auction)
+        keyboard = auction_keyboard(auction.auction_id)
+        
+        # Welcome and auction card go out as one message when they fit, same for every user
+        send_media = self.MEDIA_METHODS.get(auction.media_type) if auction.photo_url else None
+        card_text = f"{welcome_msg}\n\n{auction_message}"
+        calls = []
+        if len(card_text) > (self.CAPTION_LIMIT if send_media else self.TEXT_LIMIT):
+            calls.append(('send_message', {'text': welcome_msg, 'parse_mode': 'HTML'}))
+            card_text = auction_message
+        if send_media:
+            calls.append((send_media, {auction.media_type: auction.photo_url, 'caption': card_text,
+                                       'parse_mode': 'HTML', 'reply_markup': keyboard}))
+        else:
+            calls.append(('send_message', {'text': card_text, 'parse_mode': 'HTML', 'reply_markup': keyboard}))
         
-        # Get all users
         if self.user_repo:
-            all_users = await self.user_repo.get_all_users()
-            
-            for user in all_users:
-                if user.is_blocked or user.is_admin:
-                    continue
-                
-                try:
-                    await self.application.bot.send_message(
-                        chat_id=user.user_id,
-                        text=welcome_msg,
-                        parse_mode='Markdown'
-                    )
-                    
-                    if auction.photo_url:
-                        if auction.media_type == 'photo':
-                            await self.application.bot.send_photo(
-                                chat_id=user.user_id,
-                                photo=auction.photo_url,
-                                caption=auction_message,
-                                parse_mode='Markdown',
-                                reply_markup=keyboard
-                            )
-                        elif auction.media_type == 'video':
-                            await self.application.bot.send_video(
-                                chat_id=user.user_id,
-                                video=auction.photo_url,
-                                caption=auction_message,
-                                parse_mode='Markdown',
-                                reply_markup=keyboard
-                            )
-                        elif auction.media_type == 'animation':
-                            await self.application.bot.send_animation(
-                                chat_id=user.user_id,
-                                animation=auction.photo_url,
-                                caption=auction_message,
-                                parse_mode='Markdown',
-                                reply_markup=keyboard
-                            )
-                    else:
-                        await self.application.bot.send_message(
-                            chat_id=user.user_id,
-                            text=auction_message,
-                            parse_mode='Markdown',
-                            reply_markup=keyboard
-                        )
-                except Exception as e:
-                    logging.error(f"Failed to notify user {user.user_id} about new auction: {e}")
-
-    async def _format_auction_message(self, auction: Auction) -> str:
-        """Format auction information message"""
-        message = f"🎯 *{auction.title}*\n\n"
+            recipients = await self._get_recipients()
+            if self.broadcast_chat_id:
+                # Post once to the broadcast channel; recipients get copies instead of the full payload
+                messages = await self._post_announcement(self.broadcast_chat_id, auction, calls)
+                if messages:
+                    calls = [('copy_message', {'from_chat_id': self.broadcast_chat_id, 'message_id': message.message_id})
+                             for message in messages[:-1]]
+                    calls.append(('copy_message', {'from_chat_id': self.broadcast_chat_id,
+                                                   'message_id': messages[-1].message_id, 'reply_markup': keyboard}))
+            elif send_media and auction.photo_url.startswith(('http://', 'https://')) and recipients:
+                # Let Telegram fetch the URL once, then fan out the file_id it was stored as. Only the
+                # media call is sent, so a failed upload never leaves a recipient with a stray welcome
+                for chat_id in recipients[:self.UPLOAD_ATTEMPTS]:
+                    if await self._post_announcement(chat_id, auction, calls[-1:]):
+                        method, kwargs = calls[-1]
+                        calls[-1] = (method, {**kwargs, auction.media_type: auction.photo_url})
+                        if len(calls) == 1:
+                            recipients = [recipient for recipient in recipients if recipient != chat_id]
+                        break
+            await self.queue.broadcast(recipients, calls)
+
+    async def _post_announcement(self, chat_id: int, auction: Auction, calls: List[Tuple[str, Dict]]) -> Optional[List]:
+        """Deliver calls to one chat right away, remembering the file_id of media uploaded from a URL"""
+        try:
+            messages = await self.queue.send_now(chat_id, calls)
+        except Exception as e:
+            logging.error(f"Failed to post auction {auction.auction_id} to chat {chat_id}: {e}")
+            return None
+        
+        media = getattr(messages[-1], auction.media_type, None)
+        if media and auction.photo_url.startswith(('http://', 'https://')):
+            file_id = media[-1].file_id if auction.media_type == 'photo' else media.file_id
+            auction.photo_url = file_id
+            if self.auction_repo:
+                await self.auction_repo.update_auction_media(auction.auction_id, file_id)
+        return messages
+
+    async def format_auction_message(self, auction: Auction) -> str:
+        """Format auction information message, reusing its body until the auction changes"""
+        # Joining doesn't bump the version, so the participant count is part of the key
+        cache_key = (auction.version, auction.status, len(auction.participants))
+        cached = self._msg_cache.get(auction.auction_id)
+        if cached and cached[0] == cache_key:
+            return cached[1] + self._format_time_line(auction)
+        
+        parts = [f"🎯 <b>{html.escape(auction.title)}</b>\n\n"]
         
         if auction.description:
-            message += f"📄 {auction.description}\n\n"
+            parts.append(f"📄 {html.escape(auction.description)}\n\n")
         
-        message += f"💰 Текущая цена: *{auction.current_price:,.0f}₽*\n"
+        parts.append(f"💰 Текущая цена: <b>{auction.current_price:,.0f}₽</b>\n")
         
         leader = auction.current_leader
         if leader:
-            # Get user display name if possible
-            if self.user_repo:
-                leader_user = await self.user_repo.get_user(leader.user_id)
-                leader_name = leader_user.display_name if leader_user else leader.username
-            else:
-                leader_name = leader.username
-            message += f"👤 Лидер: {leader_name}\n"
-        
-        message += f"👥 Участников: {len(auction.participants)}\n"
-        message += f"📊 Ставок: {len(auction.bids)}\n"
-        
+            leader_name = self._leader_names.get((auction.auction_id, leader.user_id))
+            if leader_name is None:
+                # Get user display name if possible
+                if self.user_repo:
+                    leader_user = await self.user_repo.get_user(leader.user_id)
+                    leader_name = leader_user.display_name if leader_user else leader.username
+                else:
+                    leader_name = leader.username
+                self._leader_names[(auction.auction_id, leader.user_id)] = leader_name
+            parts.append(f"👤 Лидер: {html.escape(leader_name)}\n")
+        
+        parts.append(f"👥 Участников: {len(auction.participants)}\n")
+        parts.append(f"📊 Ставок: {len(auction.bids)}\n")
+        
+        body = "".join(parts)
+        self._msg_cache[auction.auction_id] = (cache_key, body)
+        return body + self._format_time_line(auction)
+
+    @staticmethod
+    def _format_time_line(auction: Auction) -> str:
+        """Countdown line, rendered on every call since it changes by the minute"""
         if auction.is_scheduled:
             if auction.time_until_start:
-                message += f"⏰ Начнется через: {auction.time_until_start}\n"
-            else:
-                message += "⏰ Готов к запуску\n"
-        elif auction.time_remaining:
-            message += f"⏰ Осталось: {auction.time_remaining}\n"
-        else:
-            message += "⏰ Бессрочный\n"
-        
-        return message
-
-    def _get_auction_keyboard(self, auction_id: UUID, is_participant: bool = False) -> 'InlineKeyboardMarkup':
-        """Generate auction inline keyboard"""
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-        
-        keyboard = []
-        
-        if not is_participant:
-            keyboard.append([InlineKeyboardButton("✅ Участвовать", callback_data=f"join_{auction_id}")])
-        else:
-            keyboard.append([InlineKeyboardButton("💸 Перебить ставку", callback_data=f"bid_{auction_id}")])
-        
-        keyboard.append([InlineKeyboardButton("ℹ️ Обновить статус", callback_data=f"status_{auction_id}")])
-        keyboard.append([InlineKeyboardButton("📱 Главное меню", callback_data="main_menu")])
-        
-        return InlineKeyboardMarkup(keyboard)
-
+                return f"⏰ Начнется через: {auction.time_until_start}\n"
+            return "⏰ Готов к запуску\n"
+        if auction.time_remaining:
+            return f"⏰ Осталось: {auction.time_remaining}\n"
+        return "⏰ Бессрочный\n"
 
 class AuctionScheduler:
     """Scheduler for automatic auction ending and activation"""
     
+    ACTIVATION_DELAY = timedelta(minutes=1)  # Scheduled auctions wait this long after creation
+    MAX_SLEEP = 300  # Safety-net poll; due times and wake() drive the loop otherwise
+    RETRY_DELAY = 60  # Seconds before retrying after a failed check
+    
     def __init__(self, auction_service: AuctionService, auction_repo: AuctionRepository):
         self.auction_service = auction_service
         self.auction_repo = auction_repo
         self.running = False
+        self._wakeup = asyncio.Event()
 
     async def start(self):
-        """Start the scheduler loop"""
+        """Start the scheduler loop, sleeping until the next auction is due"""
         self.running = True
         while self.running:
             try:
-                await self._check_expired_auctions()
-                await self._check_scheduled_auctions()
-                await asyncio.sleep(60)  # Check every minute
+                now = datetime.now()
+                await self._tick(now)
+                delay = await self._next_wakeup_delay()
             except Exception as e:
                 logging.error(f"Scheduler error: {e}")
-                await asyncio.sleep(60)
+                delay = self.RETRY_DELAY
+            
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
 
     async def stop(self):
         """Stop the scheduler"""
         self.running = False
+        self.wake()
 
-    async def _check_expired_auctions(self):
-        """Check and end expired auctions"""
-        auctions = await self.auction_repo.get_active_auctions()
-        now = datetime.now()
+    def wake(self):
+        """Re-check auctions now instead of waiting for the next due time"""
+        self._wakeup.set()
+
+    async def _next_wakeup_delay(self) -> float:
+        """Seconds until the next auction is due to end or start"""
+        due_times = []
         
-        for auction in auctions:
-            if auction.end_time and now >= auction.end_time:
-                success = await self.auction_repo.update_auction_status(auction.auction_id, AuctionStatus.COMPLETED)
-                if success and self.auction_service.notification_service:
-                    updated_auction = await self.auction_repo.get_auction(auction.auction_id)
-                    if updated_auction:
-                        await self.auction_service.notification_service.notify_auction_ended(updated_auction)
-                logging.info(f"Auto-ended auction: {auction.title}")
-
-    async def _check_scheduled_auctions(self):
-        """Check if we need to activate scheduled auctions"""
-        active_auctions = await self.auction_repo.get_active_auctions()
-        if not active_auctions:  # No active auctions
-            scheduled_auctions = await self.auction_repo.get_scheduled_auctions()
-            if scheduled_auctions:
-                # Activate the first scheduled auction
-                next_auction = scheduled_auctions[0]
-                # Check if enough time has passed (1 minute delay)
-                time_since_creation = datetime.now() - next_auction.created_at
-                if time_since_creation >= timedelta(minutes=1):
-                    await self.auction_service.activate_scheduled_auction(next_auction.auction_id)
-                    logging.info(f"Auto-activated scheduled auction: {next_auction.title}")
\ No newline at end of file
+        end_time = await self.auction_repo.get_next_end_time()
+        if end_time:
+            due_times.append(end_time)
+        
+        if not await self.auction_repo.has_active_auction():
+            created_at = await self.auction_repo.get_next_scheduled_created_at()
+            if created_at:
+                due_times.append(created_at + self.ACTIVATION_DELAY)
+        
+        if not due_times:
+            return self.MAX_SLEEP
+        
+        delay = (min(due_times) - datetime.now()).total_seconds()
+        return min(self.MAX_SLEEP, max(1, delay))
+
+    async def _tick(self, now: datetime):
+        """End expired auctions and activate the next scheduled one"""
+        expired, next_auction = await self.auction_repo.tick(now, self.ACTIVATION_DELAY)
+        
+        for auction in expired:
+            logging.info(f"Auto-ended auction: {auction.title}")
+        if expired and self.auction_service.notification_service:
+            notification_service = self.auction_service.notification_service
+            results = await asyncio.gather(
+                *(notification_service.notify_auction_ended(auction) for auction in expired),
+                return_exceptions=True
+            )
+            for auction, result in zip(expired, results):
+                if isinstance(result, Exception):
+                    logging.error(f"Failed to announce end of auction {auction.title}: {result}")
+        
+        if next_auction:
+            await self.auction_service.activate_scheduled_auction(next_auction.auction_id)
+            logging.info(f"Auto-activated scheduled auction: {next_auction.title}")
\ No newline at end of file